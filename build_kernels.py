@@ -0,0 +1,24 @@
+"""Förkompilera kärnorna i kernels.py till modulen cycling_kernels (Numba AOT).
+
+Kör `python build_kernels.py` en gång per miljö. kernels.py använder sedan den
+kompilerade modulen direkt och slipper JIT-kompileringen vid första anropet.
+"""
+import os
+import sys
+
+from numba.pycc import CC
+
+# Bygg alltid från källkoden, inte från en tidigare byggd cycling_kernels
+sys.modules["cycling_kernels"] = None
+import kernels  # noqa: E402
+
+cc = CC("cycling_kernels")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+cc.export("air_density_at", "f8(f8)")(kernels.air_density_at.py_func)
+cc.export("gradient_sin_cos", "UniTuple(f8, 2)(f8)")(kernels.gradient_sin_cos.py_func)
+cc.export("solve_speed", "f8(f8, f8, f8, f8, f8, f8, f8, f8)")(kernels.solve_speed.py_func)
+cc.export("climb_power", "UniTuple(f8, 3)(f8, f8, f8, f8, f8, f8)")(kernels.climb_power.py_func)
+
+if __name__ == "__main__":
+    cc.compile()
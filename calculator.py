@@ -1,98 +1,82 @@
+import urllib.request
+
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+
+from kernels import air_density_at, cda_estimate, g, solve_speed
+from ui_common import init_page
+
+LOGO_URL = "https://raw.githubusercontent.com/Alexbl00m/cycling-calculators/main/Logotype_Light@2x.png"
 
 # --- MÅSTE VARA FÖRST ---
-st.set_page_config(page_title="Cycling Calculators", layout="wide")
-
-# --- Custom Styling ---
-st.markdown(
-    """
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Montserrat:wght@300;400;700&display=swap');
-
-    html, body, [class*="st-"] {
-        font-family: 'Montserrat', sans-serif;
-    }
-
-    .result-container {
-        text-align: center;
-        margin-top: 30px;
-        padding: 15px;
-        border-radius: 10px;
-        background-color: #f8f9fa;
-        box-shadow: 2px 2px 10px rgba(0,0,0,0.1);
-    }
-
-    .result-title {
-        font-size: 24px;
-        font-weight: 700;
-        color: #333;
-        margin-bottom: 5px;
-    }
-
-    .result-value {
-        font-size: 32px;
-        font-weight: 400;
-        color: #E6754E;
-    }
-    </style>
-    """,
-    unsafe_allow_html=True
-)
+init_page("Cycling Calculators")
+
+
+@st.cache_resource
+def _logo():
+    # Hämta logotypen en gång per process istället för vid varje omkörning
+    try:
+        with urllib.request.urlopen(LOGO_URL, timeout=5) as response:
+            return response.read()
+    except OSError:
+        return LOGO_URL
+
 
 # --- Logotyp och titel ---
-st.image("https://raw.githubusercontent.com/Alexbl00m/cycling-calculators/main/Logotype_Light@2x.png", width=250)
+st.image(_logo(), width=250)
 st.title("🚴 Cycling Performance Calculators")
 
 # --- Kalkylatorval ---
 calculator_type = st.radio("Välj kalkylator", ["Power-to-Speed", "CdA Estimator"])
 
-# --- Gemensamma Input-parametrar ---
+# --- Val som styr vilka reglage som visas ---
 col1, col2 = st.columns(2)
+include_wind = col2.checkbox("🌬️ Inkludera vindhastighet?", value=True)
+include_slope = col1.checkbox("📈 Inkludera lutning?", value=True)
+if calculator_type == "Power-to-Speed":
+    use_custom_CdA = st.checkbox("✏️ Ange egen CdA?", value=False)
 
-temperature = col1.slider("🌡️ Temperatur (°C)", -10.0, 40.0, 20.0, 0.1)
-altitude = col2.slider("⛰️ Höjd (m)", 0, 5000, 0)
-weight = col1.slider("⚖️ Vikt (cyklist + cykel) (kg)", 50.0, 120.0, 80.0, 0.1)
-crr = col2.slider("🛞 Rullmotståndskoefficient (CRR)", 0.00150, 0.00650, 0.00366, 0.00001, format="%.5f")
+# --- Input-parametrar (skickas samlat, ingen omkörning per reglage) ---
+with st.form("calc"):
+    col1, col2 = st.columns(2)
 
-drivetrain_efficiency = col1.slider("⚙️ Drivverkets effektivitet (%)", 90.0, 100.0, 96.5, 0.1)
+    temperature = col1.slider("🌡️ Temperatur (°C)", -10.0, 40.0, 20.0, 0.1)
+    altitude = col2.slider("⛰️ Höjd (m)", 0, 5000, 0)
+    weight = col1.slider("⚖️ Vikt (cyklist + cykel) (kg)", 50.0, 120.0, 80.0, 0.1)
+    crr = col2.slider("🛞 Rullmotståndskoefficient (CRR)", 0.00150, 0.00650, 0.00366, 0.00001, format="%.5f")
 
-include_wind = col2.checkbox("🌬️ Inkludera vindhastighet?", value=True)
-if include_wind:
-    wind_speed = col2.slider("🌪️ Vindhastighet (km/h)", -20.0, 20.0, 0.0, 0.1)
+    drivetrain_efficiency = col1.slider("⚙️ Drivverkets effektivitet (%)", 90.0, 100.0, 96.5, 0.1)
 
-include_slope = col1.checkbox("📈 Inkludera lutning?", value=True)
-if include_slope:
-    slope = col1.slider("🛤️ Vägsluttning (%)", -20.0, 20.0, 0.0, 0.1)
+    if include_wind:
+        wind_speed = col2.slider("🌪️ Vindhastighet (km/h)", -20.0, 20.0, 0.0, 0.1)
 
-# --- Beräkna luftdensitet ---
-air_density = 1.225 * np.exp(-altitude / 8500)
+    if include_slope:
+        slope = col1.slider("🛤️ Vägsluttning (%)", -20.0, 20.0, 0.0, 0.1)
 
-# --- Power-to-Speed Calculator ---
-if calculator_type == "Power-to-Speed":
-    power = st.slider("⚡ Effekt (Watt)", 50, 500, 200)
+    if calculator_type == "Power-to-Speed":
+        power = st.slider("⚡ Effekt (Watt)", 50, 500, 200)
 
-    use_custom_CdA = st.checkbox("✏️ Ange egen CdA?", value=False)
-    if use_custom_CdA:
-        CdA = st.slider("✏️ Ange CdA-värde", 0.150, 0.400, 0.270, 0.001)
+        if use_custom_CdA:
+            CdA = st.slider("✏️ Ange CdA-värde", 0.150, 0.400, 0.270, 0.001)
+        else:
+            CdA = 0.270
     else:
-        CdA = 0.270
+        speed = st.slider("🚴 Hastighet (km/h)", 5.0, 60.0, 36.0, 0.1)
+        power = st.slider("⚡ Effekt (Watt)", 50, 500, 200)
 
-    g = 9.8067
-    alpha = np.arctan(slope / 100) if include_slope else 0
+    st.form_submit_button("Beräkna")
 
-    # Iterativ lösning för hastighet
-    speed = 10
-    for _ in range(100):
-        rolling_resistance = g * weight * np.cos(alpha) * crr * speed
-        gravity_force = g * weight * np.sin(alpha) * speed
-        aerodynamic_drag = 0.5 * CdA * air_density * (speed + (wind_speed if include_wind else 0)) ** 3
-        drivetrain_loss = drivetrain_efficiency / 100
-        total_power = (rolling_resistance + gravity_force + aerodynamic_drag) / drivetrain_loss
-        speed -= (total_power - power) / 100
+# --- Beräkna luftdensitet ---
+air_density = air_density_at(altitude)
 
-    speed_kmh = max(speed, 0) * 3.6
+# --- Power-to-Speed Calculator ---
+if calculator_type == "Power-to-Speed":
+    gradient = slope if include_slope else 0
+    wind = wind_speed if include_wind else 0
+
+    # Sluten lösning för hastighet
+    speed = solve_speed(power, weight, crr, CdA, air_density, gradient, wind, drivetrain_efficiency / 100)
+    speed_kmh = speed * 3.6
 
     # --- Resultat (Snygg UI) ---
     st.markdown(f"### Resultat:")
@@ -103,10 +87,6 @@ if calculator_type == "Power-to-Speed":
 
 # --- CdA Estimator Calculator ---
 elif calculator_type == "CdA Estimator":
-    speed = st.slider("🚴 Hastighet (km/h)", 5.0, 60.0, 36.0, 0.1)
-    power = st.slider("⚡ Effekt (Watt)", 50, 500, 200)
-
-    g = 9.8067
     speed_ms = speed / 3.6
     rolling_resistance = g * weight * np.cos(0) * crr * speed_ms
     gravity_force = g * weight * np.sin(0) * speed_ms
@@ -115,7 +95,7 @@ elif calculator_type == "CdA Estimator":
         st.error("Fel: Hastigheten måste vara större än 0 km/h.")
     else:
         aerodynamic_power = (power * (drivetrain_efficiency / 100)) - rolling_resistance - gravity_force
-        denominator = (0.5 * air_density * speed_ms ** 3)
+        denominator = (0.5 * air_density * speed_ms * speed_ms * speed_ms)
 
         if denominator <= 0:
             st.error("Fel: Beräkning misslyckades.")
@@ -124,3 +104,8 @@ elif calculator_type == "CdA Estimator":
 
             st.markdown(f"### Resultat:")
             st.markdown(f"#### 🌪️ CdA uppskattad: **{CdA:.3f} m²**")
+
+            # --- CdA över hela hastighetsintervallet vid samma effekt ---
+            sweep_kmh = np.linspace(5.0, 60.0, 500)
+            sweep_cda = cda_estimate(sweep_kmh / 3.6, power, weight, crr, air_density, drivetrain_efficiency / 100)
+            st.line_chart({"Hastighet (km/h)": sweep_kmh, "CdA (m²)": sweep_cda}, x="Hastighet (km/h)", y="CdA (m²)")
@@ -0,0 +1,247 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+
+from kernels import air_density_at, climb_power, g, gradient_sin_cos
+from ui_common import init_page
+
+LOGO_PATH = "Logotype_Light@2x.png"
+
+WHEEL_OPTIONS = (("700x25c (2.096m)", 2.096), ("700x28c (2.136m)", 2.136), ("700x32c (2.150m)", 2.150),
+                 ("650b x 47mm (2.000m)", 2.000))
+WHEEL_LABELS = tuple(label for label, _ in WHEEL_OPTIONS)
+WHEEL_LOOKUP = dict(WHEEL_OPTIONS)
+
+# --- Utväxlingsrutnät (byggs en gång per process) ---
+CHAINRING_OPTIONS = tuple(range(24, 69))
+SPROCKET_OPTIONS = tuple(range(10, 53))
+CHAINRINGS = np.array(CHAINRING_OPTIONS)
+SPROCKETS = np.array(SPROCKET_OPTIONS)
+GEAR_RATIOS = CHAINRINGS[:, np.newaxis] / SPROCKETS[np.newaxis, :]
+# Samma rutnät för Gear Ratio Finder: kassettkugg som rader, i float32
+GEAR_GRID = CHAINRINGS[np.newaxis, :].astype(np.float32) / SPROCKETS[:, np.newaxis].astype(np.float32)
+CADENCES = np.arange(50, 131, 5)
+
+# Över så här många celler markeras Gear Ratio Finder-tabellen inte cell för cell
+STYLED_CELL_LIMIT = 500
+
+# --- Sidor per läge: (titel, kalkylatorer) ---
+MODES = {
+    "basic": ("🚴 Gear, Speed and Climbing Calculator",
+              ["Gear Ratio Finder", "Kadens till Hastighet", "Climbing Mode"]),
+    "advanced": ("🚴 Gear, Speed and Climbing Calculator",
+                 ["Gear Ratio Finder", "Kadens till Hastighet", "Climbing Mode", "Climbing Mode (Advanced)"]),
+    "with_target": ("🚵‍♀️🏔️ Optimal Climbing Strategy",
+                    ["Optimal Climbing Strategy"]),
+}
+
+
+@st.cache_resource
+def _logo():
+    with open(LOGO_PATH, "rb") as logo_file:
+        return logo_file.read()
+
+
+@st.cache_data
+def compute_ratios(chainrings, sprockets):
+    """Tabell med utväxling (kedjekrans / kassettkugg), kassettkugg som rader, i float32."""
+    rows = np.asarray(sprockets) - SPROCKET_OPTIONS[0]
+    cols = np.asarray(chainrings) - CHAINRING_OPTIONS[0]
+    return pd.DataFrame(GEAR_GRID[np.ix_(rows, cols)], index=sprockets, columns=chainrings)
+
+
+def _result_cards(results):
+    # Alla resultatkort som en HTML-sträng, så att de skickas i ett enda meddelande
+    return "".join(
+        f"<div class='result-container'><p class='result-title'>{title}</p><p class='result-value'>{value}</p></div>"
+        for title, value in results
+    )
+
+
+# --- Kalkylator 1: Gear Ratio Finder ---
+def _gear_ratio_finder():
+    st.subheader("⚙️ Gear Ratio Finder")
+
+    col1, col2 = st.columns(2)
+    chainrings = col1.multiselect("Välj kedjekransar (Chainrings)", CHAINRING_OPTIONS, default=(48, 49, 50, 51, 52))
+    sprockets = col2.multiselect("Välj kassettkugg (Sprockets)", SPROCKET_OPTIONS, default=SPROCKET_OPTIONS[:10])
+
+    min_ratio = st.slider("Minsta tillåtna utväxling", 1.0, 5.0, 2.5, 0.1)
+
+    if chainrings and sprockets:
+        gear_ratios = compute_ratios(tuple(chainrings), tuple(sprockets))
+
+        # Jämför i samma precision som tabellen, annars missas t.ex. 2.3 >= 2.3
+        threshold = np.float32(min_ratio)
+
+        # Jämför det visade (avrundade) värdet så att markeringen stämmer med tabellen
+        above = np.round(gear_ratios.to_numpy(), 2) >= threshold
+
+        styled_table = gear_ratios.style.format("{:.2f}")
+        if gear_ratios.size <= STYLED_CELL_LIMIT:
+            styled_table = styled_table.apply(
+                lambda df: np.where(above, "background-color: #E6754E; color: white;", ""), axis=None)
+        st.subheader("Tabell över Gear Ratios")
+        st.dataframe(styled_table)
+        if gear_ratios.size > STYLED_CELL_LIMIT:
+            # Stora tabeller skickas utan färgkarta per cell
+            st.caption(f"{int(above.sum())} av {gear_ratios.size} utväxlingar är minst {min_ratio:.1f}.")
+    else:
+        st.warning("Välj minst en kedjekrans och ett kassettkugg!")
+
+
+# --- Kalkylator 2: Kadens till Hastighet ---
+def _cadence_to_speed():
+    st.subheader("🚴 Kadens till Hastighet")
+
+    col1, col2, col3 = st.columns(3)
+    chainring = col1.selectbox("Välj kedjekrans (Chainring)", CHAINRING_OPTIONS, index=24)
+    sprocket = col2.selectbox("Välj kassettkugg (Sprocket)", SPROCKET_OPTIONS, index=5)
+    cadence = col3.slider("Kadens (RPM)", 50, 130, 90)
+
+    wheel_size = st.selectbox("Välj hjulstorlek", WHEEL_LABELS, key="wheel_size_1")
+    wheel_circumference = WHEEL_LOOKUP[wheel_size]
+
+    gear_ratio = chainring / sprocket
+    speed_kmh = (cadence * gear_ratio * wheel_circumference) / (1000 / 60)
+
+    # Visa resultat
+    st.metric(label="🚀 Din hastighet", value=f"{speed_kmh:.2f} km/h")
+    st.metric(label="⚙️ Gear Ratio", value=f"{gear_ratio:.2f}")
+
+
+# --- Kalkylator 3: Climbing Mode ---
+def _climbing_mode(is_advanced):
+    st.subheader("⛰️ Climbing Mode" + (" (Advanced)" if is_advanced else ""))
+
+    # Toggle för avancerade parametrar
+    advanced_params = st.checkbox("⚙️ Aktivera avancerade parametrar")
+
+    # Reglagen skickas samlat så att beräkningen bara körs om vid "Beräkna"
+    with st.form("climb"):
+        col1, col2 = st.columns(2)
+        weight = col1.slider("Totalvikt (kg)", 50, 120, 75)
+        elevation_gain = col2.number_input("Höjdmeter att klättra (m)", min_value=5, max_value=5000, value=500)
+        climb_length = col1.number_input("Längd på klättring (km)", min_value=0.1, max_value=200.0, value=5.0)
+
+        chainring = col2.selectbox("Välj kedjekrans", CHAINRING_OPTIONS, index=24)
+        sprocket = col1.selectbox("Välj kassettkugg", SPROCKET_OPTIONS, index=5)
+        cadence = col2.slider("Kadens (RPM)", 50, 130, 90)
+
+        wheel_size = st.selectbox("Välj hjulstorlek", WHEEL_LABELS, key="wheel_size_2")
+        wheel_circumference = WHEEL_LOOKUP[wheel_size]
+
+        if advanced_params:
+            CdA = st.slider("🌪️ CdA (aerodynamisk dragkoefficient)", 0.15, 0.40, 0.275, 0.001)
+            drivetrain_efficiency = st.slider("⚙️ Drivverkets effektivitet (%)", 90.0, 100.0, 98.0)
+            crr = st.slider("🛞 Rullmotståndskoefficient (CRR)", 0.00150, 0.00650, 0.00366, 0.00001)
+            altitude = st.slider("⛰️ Höjd (m)", 0, 5000, 0)
+        else:
+            CdA = 0.275
+            drivetrain_efficiency = 98.0
+            crr = 0.00366
+            altitude = 0
+
+        submitted = st.form_submit_button("Beräkna")
+
+    # Inget räknas förrän "Beräkna" tryckts; sedan ligger resultatet kvar vid övriga omkörningar
+    if submitted:
+        st.session_state["climb_submitted"] = True
+    if not st.session_state.get("climb_submitted"):
+        return
+
+    # --- Beräkningar ---
+    gear_ratio = chainring / sprocket
+    gradient = (elevation_gain / (climb_length * 1000)) * 100
+    speed_ms = (cadence * gear_ratio * wheel_circumference) / 60
+    time_sec = (climb_length * 1000) / speed_ms
+
+    # **Ny beräkning för tid i min & sek**
+    time_min = int(time_sec // 60)
+    time_sec = int(time_sec % 60)
+
+    # **Avancerade sliders för tid och effekt**
+    adjust_power = False
+    if is_advanced:
+        time_min = st.slider("⏱️ Justera Tid (min)", 1, 120, time_min)
+        time_sec = st.slider("⏱️ Justera Sekunder", 0, 59, time_sec)
+
+        # **Uppdatera hastighet baserat på ny tid**
+        total_time_sec = (time_min * 60) + time_sec
+        speed_ms = (climb_length * 1000) / total_time_sec
+
+        adjust_power = st.checkbox("⚡ Justera Effekt manuellt")
+
+    # Fysiken behövs bara när effekten inte anges för hand
+    if adjust_power:
+        total_power = st.slider("⚡ Justera Effekt (watt)", 50, 500, 250)
+    else:
+        gravity_power, rolling_resistance, aerodynamic_drag = climb_power(weight, gradient, speed_ms, CdA, crr, air_density_at(altitude))
+        total_power = (gravity_power + rolling_resistance + aerodynamic_drag) / (drivetrain_efficiency / 100)
+
+    # --- Visa resultat ---
+    st.metric(label="⚙️ Gear Ratio", value=f"{gear_ratio:.2f}")
+    st.metric(label="📈 Gradient", value=f"{gradient:.2f} %")
+    st.metric(label="⏱️ Tid", value=f"{time_min} min {time_sec} sek")
+    st.metric(label="🚀 Hastighet", value=f"{speed_ms * 3.6:.2f} km/h")
+    st.metric(label="⚡ Effektbehov", value=f"{total_power:.2f} watt")
+
+
+# --- Kalkylator 4: Optimal Climbing Strategy ---
+def _optimal_strategy():
+    st.subheader("⛰️ Optimal Climbing Strategy")
+
+    col1, col2 = st.columns(2)
+    weight = col1.slider("Totalvikt (kg)", 50, 120, 75)
+    elevation_gain = col2.number_input("Höjdmeter att klättra (m)", min_value=10, max_value=5000, value=500)
+    climb_length = col1.number_input("Längd på klättring (km)", min_value=0.1, max_value=50.0, value=5.0)
+
+    target_power = col2.slider("🎯 Måleffekt (Watt)", 100, 500, 250)
+
+    wheel_size = st.selectbox("Välj hjulstorlek", WHEEL_LABELS, key="wheel_size_4")
+    wheel_circumference = WHEEL_LOOKUP[wheel_size]
+
+    # Alla kombinationer av kedjekrans, kassettkugg och kadens på en gång
+    gradient = (elevation_gain / (climb_length * 1000)) * 100
+    sin_alpha, _ = gradient_sin_cos(gradient)
+    speeds_ms = (CADENCES * GEAR_RATIOS[:, :, np.newaxis] * wheel_circumference) / 60
+    power_needed = g * weight * sin_alpha * speeds_ms
+
+    best = np.unravel_index(np.argmin(np.abs(power_needed - target_power)), power_needed.shape)
+    best_ratio = GEAR_RATIOS[best[:2]]
+    best_cadence = int(CADENCES[best[2]])
+    best_speed = speeds_ms[best] * 3.6
+
+    st.markdown(_result_cards([
+        ("🎯 Optimal Kadens", f"{best_cadence} RPM"),
+        ("⚙️ Optimal Utväxling", f"{best_ratio:.2f}"),
+        ("🚀 Hastighet", f"{best_speed:.2f} km/h"),
+    ]), unsafe_allow_html=True)
+
+
+CALCULATORS = {
+    "Gear Ratio Finder": _gear_ratio_finder,
+    "Kadens till Hastighet": _cadence_to_speed,
+    "Climbing Mode": lambda: _climbing_mode(is_advanced=False),
+    "Climbing Mode (Advanced)": lambda: _climbing_mode(is_advanced=True),
+    "Optimal Climbing Strategy": _optimal_strategy,
+}
+
+
+def render(mode):
+    """Rendera en kalkylatorsida; mode är "basic", "advanced" eller "with_target"."""
+    title, calculators = MODES[mode]
+
+    # --- MÅSTE VARA FÖRST ---
+    init_page("Cykelkalkylator")
+
+    # --- Logotyp och titel ---
+    st.image(_logo(), width=250)
+    st.title(title)
+
+    # --- Välj kalkylator ---
+    if mode == "advanced":
+        st.write("Välj vilken beräkning du vill göra:")
+    calculator_type = st.radio("Välj kalkylator", calculators)
+
+    CALCULATORS[calculator_type]()
@@ -1,40 +1,46 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from scipy.optimize import curve_fit
-import base64
-from io import BytesIO
 import plotly.graph_objects as go
-import plotly.express as px
-from PIL import Image
 import math
 import os
+import logging
 import traceback
 
-# Debug mode for troubleshooting
-DEBUG = False
-
-# Helper function for debugging
-def debug_print(message):
-    if DEBUG:
-        st.write(f"DEBUG: {message}")
+try:
+    from numba import njit
+except ImportError:  # Numba not installed: the models run as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Debug mode for troubleshooting (enable with CP_DEBUG=1)
+DEBUG = bool(os.environ.get("CP_DEBUG"))
+logger = logging.getLogger("cp")
+if DEBUG:
+    logging.basicConfig()
+    logger.setLevel(logging.DEBUG)
+
+# Helper function for debugging; callable args are only evaluated when debug is on
+def debug_print(message, *args):
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(message, *(arg() if callable(arg) else arg for arg in args))
 
 # Set page configuration
-try:
-    st.set_page_config(
-        page_title="Critical Power Calculator",
-        page_icon="🚴",
-        layout="wide",
-        initial_sidebar_state="expanded"
-    )
-    debug_print("Page configuration set successfully")
-except Exception as e:
-    st.error(f"Error setting page configuration: {e}")
+st.set_page_config(
+    page_title="Critical Power Calculator",
+    page_icon="🚴",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+debug_print("Page configuration set successfully")
 
 # Custom CSS with Montserrat font and brand colors
-try:
-    st.markdown("""
+@st.cache_resource
+def _get_css():
+    return """
     <style>
     @import url('https://fonts.googleapis.com/css2?family=Montserrat:wght@300;400;500;600;700&display=swap');
 
@@ -93,6 +99,11 @@ try:
         margin-bottom: 10px;
     }
 
+    .metric-grid {
+        display: grid;
+        column-gap: 1rem;
+    }
+
     .metric-value {
         font-size: 24px;
         font-weight: 600;
@@ -139,78 +150,79 @@ try:
         border-radius: 0 8px 8px 0;
     }
     </style>
-    """, unsafe_allow_html=True)
-    debug_print("Custom CSS applied successfully")
-except Exception as e:
-    st.error(f"Error applying custom CSS: {e}")
+    """
+
+@st.cache_resource
+def _inject_css():
+    # Streamlit replays the cached markdown element on every cache hit
+    st.markdown(_get_css(), unsafe_allow_html=True)
+
+_inject_css()
+debug_print("Custom CSS applied successfully")
 
 # Add logo to the sidebar
+LOGO_URL = "https://raw.githubusercontent.com/Alexbl00m/cycling-calculators/main/Logotype_Light@2x.png"
+LOGO_PATHS = [
+    "Logotype_Light@2x.png",  # Direct in root
+    ".devcontainer/Logotype_Light@2x.png"  # In .devcontainer
+]
+
+@st.cache_resource
+def _resolve_logo_path():
+    """Return the first local logo file found, falling back to the hosted logo"""
+    for path in LOGO_PATHS:
+        if os.path.exists(path):
+            return path
+    return LOGO_URL
+
 def add_logo():
     try:
-        # Try different possible logo paths
-        logo_paths = [
-            "https://raw.githubusercontent.com/Alexbl00m/cycling-calculators/main/Logotype_Light@2x.png",  # Direct in root
-            "Logotype_Light@2x.png",  # In logo folder
-            ".devcontainer/Logotype_Light@2x.png"  # In .devcontainer
-        ]
-        
-        logo_loaded = False
-        for path in logo_paths:
-            try:
-                st.sidebar.image(path, width=200)
-                debug_print(f"Logo loaded from: {path}")
-                logo_loaded = True
-                break
-            except:
-                continue
-        
-        if not logo_loaded:
-            st.sidebar.markdown("""
-            <div style="font-family: 'Montserrat', sans-serif; color: #E6754E; font-size: 28px; font-weight: 600;">
-                LINDBLOM COACHING
-            </div>
-            """, unsafe_allow_html=True)
-            debug_print("Used text fallback for logo")
+        path = _resolve_logo_path()
+        st.sidebar.image(path, width=200)
+        debug_print(f"Logo loaded from: {path}")
     except Exception as e:
-        st.sidebar.write("Lindblom Coaching")
-        debug_print(f"Logo error: {str(e)}")
+        st.sidebar.markdown("""
+        <div style="font-family: 'Montserrat', sans-serif; color: #E6754E; font-size: 28px; font-weight: 600;">
+            LINDBLOM COACHING
+        </div>
+        """, unsafe_allow_html=True)
+        debug_print(f"Used text fallback for logo: {str(e)}")
 
-try:
-    add_logo()
-    debug_print("Logo function executed")
-except Exception as e:
-    st.sidebar.write("Lindblom Coaching")
-    debug_print(f"Logo function error: {str(e)}")
+add_logo()
+debug_print("Logo function executed")
 
 # Helper function for the hyperbolic model of Critical Power
+@njit(cache=True, fastmath=True)
 def cp_model(t, cp, w_prime):
     """The classic hyperbolic Critical Power model (Monod & Scherrer, 1965)"""
     return cp + (w_prime / t)
 
 # Helper function for the 3-parameter CP model
+@njit(cache=True, fastmath=True)
 def cp_model_3param(t, cp, w_prime, tau):
     """Three-parameter critical power model with time constant (Morton, 1996)"""
     return cp + (w_prime / (t + tau))
 
 # Helper function for the exponential model
+@njit(cache=True, fastmath=True)
 def exp_model(t, p_max, cp, tau):
     """Exponential critical power model (Wilkie, 1980)"""
     return cp + (p_max - cp) * np.exp(-t/tau)
 
 # Modified 5-min test Ramp Test calculation (Pettitt et al., 2019)
-def calculate_cp_5min_test(power_5min, weight):
-    """Calculate CP from 5-min test based on Pettitt et al. (2019)"""
+def calculate_cp_5min_test(power_5min):
+    """Calculate CP from 5-min test based on Pettitt et al. (2019); FTP is 95% of CP"""
     cp = 0.80 * power_5min
-    w_prime = (power_5min - cp) * 300  # 5min = 300s
-    ftp = 0.95 * cp  # Approximate FTP as 95% of CP
+    w_prime = 0.20 * power_5min * 300  # (power - CP) over 5min = 300s
+    ftp = 0.76 * power_5min  # 0.95 * 0.80
     return cp, w_prime, ftp
 
 # 6-min test method (Vautier et al., 1995)
-def calculate_cp_6min_test(power_6min, weight):
-    """Calculate CP from 6-min test based on Vautier et al. (1995)"""
+def calculate_cp_6min_test(power_6min):
+    """Calculate CP from 6-min test based on Vautier et al. (1995); FTP is 95% of CP"""
     cp = 0.825 * power_6min
-    w_prime = (power_6min - cp) * 360  # 6min = 360s
-    ftp = 0.95 * cp  # Approximate FTP as 95% of CP
+    w_prime = 0.175 * power_6min * 360  # (power - CP) over 6min = 360s
+    ftp = 0.78375 * power_6min  # 0.95 * 0.825
     return cp, w_prime, ftp
 
 def calculate_cp_3min_test(end_power, avg_power=None, calculation_method="standard"):
@@ -284,42 +296,45 @@ def calculate_cp_3min_test(end_power, avg_power=None, calculation_method="standa
     return cp, w_prime, ftp, adjustment_description
 
 # Ramp test (Ramp Rate method, Díaz et al., 2018)
+# Relationship between peak ramp power and CP depends on ramp rate
+# Based on research findings, CP is approximately 75-82% of peak ramp power
+RAMP_CP_FACTOR = 0.75  # This can be adjusted based on the specific ramp protocol
+RAMP_FTP_FACTOR = 0.95 * RAMP_CP_FACTOR  # FTP as 95% of CP, folded once at import
+
 def calculate_cp_ramp_test(max_power, ramp_rate, weight):
-    """Calculate CP from ramp test based on Díaz et al. (2018)"""
-    # Relationship between peak ramp power and CP depends on ramp rate
-    # Based on research findings, CP is approximately 75-82% of peak ramp power
-    factor = 0.75  # This can be adjusted based on the specific ramp protocol
-    cp = factor * max_power
+    """Calculate CP from ramp test based on Díaz et al. (2018); FTP is 95% of CP"""
+    cp = RAMP_CP_FACTOR * max_power
     
     # W' can be estimated (this is an approximation)
     # Research has shown W' ~ 20-30 kJ for most cyclists
     w_prime = 20000 + (weight * 100)  # Simple approximation based on body weight
     
-    ftp = 0.95 * cp
+    ftp = RAMP_FTP_FACTOR * max_power
     return cp, w_prime, ftp
 
 # Multi-effort Critical Power calculation (2-parameter model)
-def calculate_cp_multi_effort(efforts):
+def calculate_cp_multi_effort(times, powers):
     """
     Calculate CP and W' using the 2-parameter hyperbolic model
     
-    efforts: list of tuples (time_seconds, power_watts)
+    times: ndarray of effort durations (seconds)
+    powers: ndarray of average effort powers (watts), same length as times
     """
-    times = np.array([e[0] for e in efforts])
-    powers = np.array([e[1] for e in efforts])
-    
     # Work done for each effort
     work = times * powers
     
     # Linear form of the CP model: Work = W' + CP * Time
-    if len(efforts) < 2:
+    if len(times) < 2:
         return None, None, None
     
     try:
-        # Fit linear regression to estimate CP and W'
-        result = np.polyfit(times, work, 1)
-        cp = result[0]  # Slope
-        w_prime = result[1]  # Intercept
+        # Closed-form least squares fit of Work = W' + CP * Time
+        time_dev = times - times.mean()
+        time_var = (time_dev * time_dev).sum()
+        if time_var == 0:  # All efforts have the same duration
+            return None, None, None
+        cp = (time_dev * (work - work.mean())).sum() / time_var  # Slope
+        w_prime = work.mean() - cp * times.mean()  # Intercept
         
         if cp <= 0 or w_prime <= 0:
             return None, None, None
@@ -355,28 +370,27 @@ def calculate_fitness_metrics(cp, w_prime, weight):
         
     return cp_per_kg, w_prime_cp_ratio, estimated_vo2max
 
-def create_power_duration_curve(cp, w_prime, time_range=None):
+# Fixed time axis for the power-duration curve (10s to 1hr), built once per process
+_PD_TIME_RANGE = 10.0 ** np.linspace(1.0, math.log10(3600.0), 100)
+_PD_TIME_MIN, _PD_TIME_MAX = _PD_TIME_RANGE[0], _PD_TIME_RANGE[-1]
+
+def create_power_duration_curve(cp, w_prime, time_range=_PD_TIME_RANGE):
     """Create a power-duration curve based on CP and W'"""
-    if time_range is None:
-        time_range = np.logspace(1, np.log10(3600), 100)  # 10s to 1hr
-    
-    power_curve = [cp + (w_prime / t) for t in time_range]
+    power_curve = cp + w_prime / time_range
     
     return time_range, power_curve
 
-def plot_power_duration_curve(cp, w_prime, efforts=None):
+@st.cache_resource(max_entries=64)
+def plot_power_duration_curve(cp, w_prime, effort_times=None, effort_powers=None):
     """Plot the power-duration curve with actual efforts if provided"""
-    # Create time range for the curve
-    time_range = np.logspace(1, np.log10(3600), 100)  # 10s to 1hr
-    
-    # Create the theoretical power curve
-    time_range, power_curve = create_power_duration_curve(cp, w_prime, time_range)
+    # Create the theoretical power curve (10s to 1hr)
+    time_range, power_curve = create_power_duration_curve(cp, w_prime)
     
     # Create the plot
     fig = go.Figure()
     
     # Add the theoretical curve
-    fig.add_trace(go.Scatter(
+    fig.add_trace(go.Scattergl(
         x=time_range,
         y=power_curve,
         mode='lines',
@@ -385,8 +399,8 @@ def plot_power_duration_curve(cp, w_prime, efforts=None):
     ))
     
     # Add the CP horizontal line
-    fig.add_trace(go.Scatter(
-        x=[min(time_range), max(time_range)],
+    fig.add_trace(go.Scattergl(
+        x=[_PD_TIME_MIN, _PD_TIME_MAX],
         y=[cp, cp],
         mode='lines',
         name='Critical Power',
@@ -394,13 +408,10 @@ def plot_power_duration_curve(cp, w_prime, efforts=None):
     ))
     
     # Add the efforts if provided
-    if efforts:
-        times = [e[0] for e in efforts]
-        powers = [e[1] for e in efforts]
-        
-        fig.add_trace(go.Scatter(
-            x=times,
-            y=powers,
+    if effort_times is not None and len(effort_times):
+        fig.add_trace(go.Scattergl(
+            x=effort_times,
+            y=effort_powers,
             mode='markers',
             name='Test Efforts',
             marker=dict(
@@ -447,39 +458,81 @@ def power_zone_calculator(ftp):
     }
     return zones
 
+@st.cache_data(max_entries=128)
+def get_zones_df(ftp):
+    """Power zone table for display, cached per FTP"""
+    zones = power_zone_calculator(ftp)
+    names, lower, upper = [], [], []
+    for zone, (low, high) in zones.items():
+        names.append(zone)
+        lower.append(f"{int(low)} W")
+        upper.append(f"{int(high)} W" if high != float('inf') else "Max")
+    return pd.DataFrame({"Zone": names, "Lower Bound": lower, "Upper Bound": upper})
+
+# Classification thresholds based on research and commonly used benchmarks,
+# indexed by the number of thresholds met
+_CLASS_LEVELS = ['Untrained', 'Recreational', 'Trained', 'Competitive', 'Elite']
+_CLASS_THRESHOLDS = {
+    'male': {'cp_kg': np.array([2.5, 3.5, 4.2, 5.0]), 'w_prime_cp': np.array([20, 25, 30, 40])},
+    'female': {'cp_kg': np.array([2.0, 3.0, 3.7, 4.5]), 'w_prime_cp': np.array([15, 20, 25, 35])}
+}
+
+@st.cache_data(max_entries=1024)
 def classify_cyclist(cp_per_kg, w_prime_cp_ratio, gender='male'):
     """Classify cyclist based on CP/kg and W'/CP ratio"""
-    # Classification thresholds based on research and commonly used benchmarks
-    if gender.lower() == 'male':
-        thresholds = {
-            'Recreational': {'cp_kg': 2.5, 'w_prime_cp': 20},
-            'Trained': {'cp_kg': 3.5, 'w_prime_cp': 25},
-            'Competitive': {'cp_kg': 4.2, 'w_prime_cp': 30},
-            'Elite': {'cp_kg': 5.0, 'w_prime_cp': 40}
-        }
-    else:  # female
-        thresholds = {
-            'Recreational': {'cp_kg': 2.0, 'w_prime_cp': 15},
-            'Trained': {'cp_kg': 3.0, 'w_prime_cp': 20},
-            'Competitive': {'cp_kg': 3.7, 'w_prime_cp': 25},
-            'Elite': {'cp_kg': 4.5, 'w_prime_cp': 35}
-        }
+    thresholds = _CLASS_THRESHOLDS['male' if gender.lower() == 'male' else 'female']
     
     # Determine aerobic classification based on CP/kg
-    aero_class = 'Untrained'
-    for level, values in thresholds.items():
-        if cp_per_kg >= values['cp_kg']:
-            aero_class = level
+    aero_class = _CLASS_LEVELS[np.count_nonzero(cp_per_kg >= thresholds['cp_kg'])]
     
     # Determine anaerobic classification based on W'/CP
     anaero_class = 'Untrained'
     if w_prime_cp_ratio is not None:
-        for level, values in thresholds.items():
-            if w_prime_cp_ratio >= values['w_prime_cp']:
-                anaero_class = level
+        anaero_class = _CLASS_LEVELS[np.count_nonzero(w_prime_cp_ratio >= thresholds['w_prime_cp'])]
     
     return aero_class, anaero_class
 
+# Training recommendations per CP/kg tier
+_TRAINING_MD = {
+    "beginner": """
+    **Focus areas for improvement:**
+    - Build aerobic base with longer, lower intensity rides (Zone 2)
+    - Start with 2-3 structured workouts per week
+    - Include one threshold workout (Zone 4) per week
+    - Rest and recovery are essential - don't overdo it
+    """,
+    "intermediate": """
+    **Focus areas for improvement:**
+    - Continue aerobic development with polarized training
+    - Include specific threshold workouts (Zone 4) twice weekly
+    - Add VO2max intervals (Zone 5) once per week
+    - Consider specific work to improve W' with short, high-intensity intervals
+    """,
+    "advanced": """
+    **Focus areas for improvement:**
+    - Highly targeted training based on your specific strengths/weaknesses
+    - Periodize training to peak for key events
+    - Include specific workouts targeting CP (long intervals at 95-105% of CP)
+    - For W' development, include very short, maximal efforts with full recovery
+    """
+}
+
+def _training_tier(cp_per_kg):
+    """Training recommendation tier for a CP/kg value"""
+    if cp_per_kg < 2.5:
+        return "beginner"
+    if cp_per_kg < 4.0:
+        return "intermediate"
+    return "advanced"
+
+def _metric(label, value):
+    """HTML for a single metric card"""
+    return f'<div class="metric-card"><div class="metric-label">{label}</div><div class="metric-value">{value}</div></div>'
+
+def _metric_grid(cards, columns):
+    """Lay out metric cards in a CSS grid so a whole section is one markdown call"""
+    return f'<div class="metric-grid" style="grid-template-columns: repeat({columns}, 1fr);">{"".join(cards)}</div>'
+
 # Main application layout
 def main():
     try:
@@ -657,7 +710,7 @@ def main():
                                         min_value=50, max_value=1000, value=250)
             
             if st.button("Calculate Critical Power"):
-                cp, w_prime, ftp = calculate_cp_5min_test(power_5min, weight)
+                cp, w_prime, ftp = calculate_cp_5min_test(power_5min)
                 
                 st.markdown("""
                 <div class="reference">
@@ -673,7 +726,7 @@ def main():
                                         min_value=50, max_value=1000, value=240)
             
             if st.button("Calculate Critical Power"):
-                cp, w_prime, ftp = calculate_cp_6min_test(power_6min, weight)
+                cp, w_prime, ftp = calculate_cp_6min_test(power_6min)
                 
                 st.markdown("""
                 <div class="reference">
@@ -761,47 +814,45 @@ def main():
         elif method == "Multi-Effort Method (2-4 efforts)":
             st.write("Enter data from 2-4 maximal efforts at different durations:")
             
-            col1, col2 = st.columns(2)
-            
-            efforts = []
+            # Batch the inputs so filling in the efforts does not rerun the page per field
+            with st.form("multi_effort"):
+                col1, col2 = st.columns(2)
             
-            with col1:
-                time1 = st.number_input("Duration of Effort 1 (seconds)", 
-                          min_value=60, max_value=600, value=180)
-                time2 = st.number_input("Duration of Effort 2 (seconds)", 
-                                      min_value=60, max_value=1800, value=360)
-                # Set min_value to 0 for optional efforts
-                time3 = st.number_input("Duration of Effort 3 (seconds) (optional)", 
-                                      min_value=0, max_value=3600, value=720)
-                time4 = st.number_input("Duration of Effort 4 (seconds) (optional)", 
-                                      min_value=0, max_value=3600, value=1200)
+                with col1:
+                    time1 = st.number_input("Duration of Effort 1 (seconds)", 
+                              min_value=60, max_value=600, value=180)
+                    time2 = st.number_input("Duration of Effort 2 (seconds)", 
+                                          min_value=60, max_value=1800, value=360)
+                    # Set min_value to 0 for optional efforts
+                    time3 = st.number_input("Duration of Effort 3 (seconds) (optional)", 
+                                          min_value=0, max_value=3600, value=720)
+                    time4 = st.number_input("Duration of Effort 4 (seconds) (optional)", 
+                                          min_value=0, max_value=3600, value=1200)
                         
-            with col2:
-                power1 = st.number_input("Average Power of Effort 1 (watts)", 
-                                       min_value=0, max_value=2000, value=300)
-                power2 = st.number_input("Average Power of Effort 2 (watts)", 
-                                       min_value=0, max_value=2000, value=250)
-                power3 = st.number_input("Average Power of Effort 3 (watts)", 
-                                       min_value=0, max_value=2000, value=0)
-                power4 = st.number_input("Average Power of Effort 4 (watts)", 
-                                       min_value=0, max_value=2000, value=0)
-            
-            # Collect valid efforts (non-zero duration and power)
-            if time1 > 0 and power1 > 0:
-                efforts.append((time1, power1))
-            if time2 > 0 and power2 > 0:
-                efforts.append((time2, power2))
-            if time3 > 0 and power3 > 0:
-                efforts.append((time3, power3))
-            if time4 > 0 and power4 > 0:
-                efforts.append((time4, power4))
-            
-            if st.button("Calculate Critical Power"):
-                if len(efforts) < 2:
+                with col2:
+                    power1 = st.number_input("Average Power of Effort 1 (watts)", 
+                                           min_value=0, max_value=2000, value=300)
+                    power2 = st.number_input("Average Power of Effort 2 (watts)", 
+                                           min_value=0, max_value=2000, value=250)
+                    power3 = st.number_input("Average Power of Effort 3 (watts)", 
+                                           min_value=0, max_value=2000, value=0)
+                    power4 = st.number_input("Average Power of Effort 4 (watts)", 
+                                           min_value=0, max_value=2000, value=0)
+                
+                submitted = st.form_submit_button("Calculate Critical Power")
+            
+            if submitted:
+                # Collect valid efforts (non-zero duration and power)
+                effort_times = np.array([time1, time2, time3, time4], dtype=np.float64)
+                effort_powers = np.array([power1, power2, power3, power4], dtype=np.float64)
+                valid = (effort_times > 0) & (effort_powers > 0)
+                effort_times, effort_powers = effort_times[valid], effort_powers[valid]
+                
+                if len(effort_times) < 2:
                     st.error("Please provide at least 2 valid efforts with duration and power")
                     cp, w_prime, ftp = None, None, None
                 else:
-                    cp, w_prime, ftp = calculate_cp_multi_effort(efforts)
+                    cp, w_prime, ftp = calculate_cp_multi_effort(effort_times, effort_powers)
                     
                     st.markdown("""
                     <div class="reference">
@@ -818,40 +869,12 @@ def main():
             st.write("## Results")
             debug_print("Displaying results")
             
-            # Create three columns for the main metrics
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-label">Critical Power (CP)</div>
-                    <div class="metric-value">{cp:.0f} W</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                if w_prime is not None:
-                    st.markdown(f"""
-                    <div class="metric-card">
-                        <div class="metric-label">W' (Anaerobic Work Capacity)</div>
-                        <div class="metric-value">{w_prime/1000:.1f} kJ</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown(f"""
-                    <div class="metric-card">
-                        <div class="metric-label">W' (Anaerobic Work Capacity)</div>
-                        <div class="metric-value">Not available for this test</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-            
-            with col3:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-label">Functional Threshold Power (FTP)</div>
-                    <div class="metric-value">{ftp:.0f} W</div>
-                </div>
-                """, unsafe_allow_html=True)
+            # Main metrics, sent as one grid instead of one message per card
+            st.markdown(_metric_grid([
+                _metric("Critical Power (CP)", f"{cp:.0f} W"),
+                _metric("W' (Anaerobic Work Capacity)", f"{w_prime/1000:.1f} kJ" if w_prime is not None else "Not available for this test"),
+                _metric("Functional Threshold Power (FTP)", f"{ftp:.0f} W"),
+            ], columns=3), unsafe_allow_html=True)
             
             # Calculate additional metrics
             cp_per_kg, w_prime_cp_ratio, estimated_vo2max = calculate_fitness_metrics(cp, w_prime, weight)
@@ -859,51 +882,18 @@ def main():
             # Display additional metrics
             st.write("### Additional Metrics")
             
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                if cp_per_kg is not None:
-                    st.markdown(f"""
-                    <div class="metric-card">
-                        <div class="metric-label">Critical Power to Weight Ratio</div>
-                        <div class="metric-value">{cp_per_kg:.2f} W/kg</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                if estimated_vo2max is not None:
-                    st.markdown(f"""
-                    <div class="metric-card">
-                        <div class="metric-label">Estimated VO2max</div>
-                        <div class="metric-value">{estimated_vo2max:.1f} ml/kg/min</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-            
-            with col2:
-                if w_prime is not None and w_prime_cp_ratio is not None:
-                    st.markdown(f"""
-                    <div class="metric-card">
-                        <div class="metric-label">W'/CP Ratio</div>
-                        <div class="metric-value">{w_prime_cp_ratio:.1f} J/W</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown(f"""
-                    <div class="metric-card">
-                        <div class="metric-label">W'/CP Ratio</div>
-                        <div class="metric-value">Not available</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-label">FTP to Weight Ratio</div>
-                    <div class="metric-value">{ftp/weight:.2f} W/kg</div>
-                </div>
-                """, unsafe_allow_html=True)
+            cards = []
+            if cp_per_kg is not None:
+                cards.append(_metric("Critical Power to Weight Ratio", f"{cp_per_kg:.2f} W/kg"))
+            if w_prime is not None and w_prime_cp_ratio is not None:
+                cards.append(_metric("W'/CP Ratio", f"{w_prime_cp_ratio:.1f} J/W"))
+            else:
+                cards.append(_metric("W'/CP Ratio", "Not available"))
+            if estimated_vo2max is not None:
+                cards.append(_metric("Estimated VO2max", f"{estimated_vo2max:.1f} ml/kg/min"))
+            cards.append(_metric("FTP to Weight Ratio", f"{ftp/weight:.2f} W/kg"))
+            st.markdown(_metric_grid(cards, columns=2), unsafe_allow_html=True)
             
-# Fix 4: Update the Classification check to handle None values
-# Replace the classification check:
-
             # Classification
             if cp_per_kg is not None:
                 # Only attempt to get anaerobic class if w_prime_cp_ratio is available
@@ -911,38 +901,17 @@ def main():
                 
                 st.write("### Cyclist Classification")
                 
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.markdown(f"""
-                    <div class="metric-card">
-                        <div class="metric-label">Aerobic Classification</div>
-                        <div class="metric-value">{aero_class}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with col2:
-                    # Only display anaerobic classification if available
-                    if w_prime_cp_ratio is not None:
-                        st.markdown(f"""
-                        <div class="metric-card">
-                            <div class="metric-label">Anaerobic Classification</div>
-                            <div class="metric-value">{anaero_class}</div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    else:
-                        st.markdown(f"""
-                        <div class="metric-card">
-                            <div class="metric-label">Anaerobic Classification</div>
-                            <div class="metric-value">Not available for this test</div>
-                        </div>
-                        """, unsafe_allow_html=True)
+                # Only display anaerobic classification if available
+                st.markdown(_metric_grid([
+                    _metric("Aerobic Classification", aero_class),
+                    _metric("Anaerobic Classification", anaero_class if w_prime_cp_ratio is not None else "Not available for this test"),
+                ], columns=2), unsafe_allow_html=True)
             
             # Power-Duration Curve
             st.write("### Power-Duration Curve")
             if w_prime is not None:
-                if method == "Multi-Effort Method (2-4 efforts)" and len(efforts) >= 2:
-                    fig = plot_power_duration_curve(cp, w_prime, efforts)
+                if method == "Multi-Effort Method (2-4 efforts)" and len(effort_times) >= 2:
+                    fig = plot_power_duration_curve(cp, w_prime, effort_times, effort_powers)
                 else:
                     fig = plot_power_duration_curve(cp, w_prime)
                 
@@ -952,43 +921,13 @@ def main():
             
             # Training Zones
             st.write("### Power Training Zones")
-            zones = power_zone_calculator(ftp)
-            
-            # Create a DataFrame for the zones
-            zones_df = pd.DataFrame([
-                {"Zone": zone, "Lower Bound": f"{int(bounds[0])} W", "Upper Bound": f"{int(bounds[1])} W" if bounds[1] != float('inf') else "Max"}
-                for zone, bounds in zones.items()
-            ])
-            
+            zones_df = get_zones_df(ftp)
             st.table(zones_df)
             
             # Training recommendations
             st.write("### Training Recommendations")
             
-            if cp_per_kg < 2.5:  # Beginner
-                st.markdown("""
-                **Focus areas for improvement:**
-                - Build aerobic base with longer, lower intensity rides (Zone 2)
-                - Start with 2-3 structured workouts per week
-                - Include one threshold workout (Zone 4) per week
-                - Rest and recovery are essential - don't overdo it
-                """)
-            elif cp_per_kg < 4.0:  # Intermediate
-                st.markdown("""
-                **Focus areas for improvement:**
-                - Continue aerobic development with polarized training
-                - Include specific threshold workouts (Zone 4) twice weekly
-                - Add VO2max intervals (Zone 5) once per week
-                - Consider specific work to improve W' with short, high-intensity intervals
-                """)
-            else:  # Advanced
-                st.markdown("""
-                **Focus areas for improvement:**
-                - Highly targeted training based on your specific strengths/weaknesses
-                - Periodize training to peak for key events
-                - Include specific workouts targeting CP (long intervals at 95-105% of CP)
-                - For W' development, include very short, maximal efforts with full recovery
-                """)
+            st.markdown(_TRAINING_MD[_training_tier(cp_per_kg)])
             
             # Footer with references
             st.markdown("""
@@ -999,7 +938,7 @@ def main():
             """, unsafe_allow_html=True)
     except Exception as e:
         st.error(f"An error occurred: {str(e)}")
-        debug_print(f"Exception details: {traceback.format_exc()}")
+        debug_print("Exception details: %s", traceback.format_exc)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,90 @@
+import math
+
+import numpy as np
+
+try:
+    from numba import njit, vectorize
+except ImportError:  # Numba saknas: kärnorna körs som vanlig Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+    def vectorize(*args, **kwargs):
+        return lambda func: np.vectorize(func, otypes=[float])
+
+g = 9.8067  # Gravitationskraft
+
+
+@njit(cache=True, fastmath=True)
+def air_density_at(altitude):
+    """Luftdensitet (kg/m³) på given höjd enligt en exponentiell atmosfärsmodell."""
+    return 1.225 * math.exp(-altitude / 8500.0)
+
+
+@njit(cache=True, fastmath=True)
+def gradient_sin_cos(gradient):
+    """sin och cos av lutningsvinkeln för en lutning i procent, utan arctan.
+
+    Med t = gradient / 100 gäller sin(atan(t)) = t / sqrt(1 + t²) och
+    cos(atan(t)) = 1 / sqrt(1 + t²).
+    """
+    t = gradient / 100
+    inv = 1.0 / math.sqrt(1.0 + t * t)
+    return t * inv, inv
+
+
+@njit(cache=True, fastmath=True)
+def solve_speed(power, weight, crr, CdA, air_density, gradient, wind, eta):
+    """Hastighet (m/s) där effektbalansen går jämnt ut, löst i sluten form.
+
+    Effektbalansen k_aero * (v + w)^3 + k_lin * v = P * eta blir med u = v + w
+    en reducerad tredjegradsekvation u^3 + p*u + q = 0 som löses med Cardanos
+    formel. Med tre reella rötter (brant nedförsbacke) väljs den största.
+    """
+    sin_alpha, cos_alpha = gradient_sin_cos(gradient)
+    k_lin = g * weight * (cos_alpha * crr + sin_alpha)
+    k_aero = 0.5 * CdA * air_density
+    p = k_lin / k_aero
+    q = -(power * eta + k_lin * wind) / k_aero
+
+    half_q = q / 2
+    third_p = p / 3
+    discriminant = half_q * half_q + third_p * third_p * third_p
+    if discriminant >= 0:
+        root = math.sqrt(discriminant)
+        a = -half_q + root
+        b = -half_q - root
+        u = math.copysign(abs(a) ** (1 / 3), a) + math.copysign(abs(b) ** (1 / 3), b)
+    else:
+        # Avrundning nära diskriminanten 0 kan ge |cos_arg| > 1 och därmed NaN
+        cos_arg = min(max(3 * q / (2 * p) * math.sqrt(-3 / p), -1.0), 1.0)
+        u = 2 * math.sqrt(-p / 3) * math.cos(math.acos(cos_arg) / 3)
+
+    return max(u - wind, 0.0)
+
+
+@njit(cache=True, fastmath=True)
+def climb_power(weight, gradient, speed_ms, CdA, crr, air_density):
+    """Gravitations-, rull- och luftmotståndseffekt (W) vid given hastighet i backe."""
+    sin_alpha, cos_alpha = gradient_sin_cos(gradient)
+    gravity = g * weight * sin_alpha * speed_ms
+    rolling = g * weight * cos_alpha * crr * speed_ms
+    aerodynamic = 0.5 * CdA * air_density * speed_ms * speed_ms * speed_ms
+    return gravity, rolling, aerodynamic
+
+
+@vectorize(["float64(float64, float64, float64, float64, float64, float64)"], cache=True, fastmath=True)
+def cda_estimate(speed_ms, power, weight, crr, air_density, eta):
+    """CdA (m²) på plant underlag; elementvis över t.ex. en hastighetssvep."""
+    rolling = g * weight * crr * speed_ms
+    aerodynamic_power = power * eta - rolling
+    return max(aerodynamic_power / (0.5 * air_density * speed_ms * speed_ms * speed_ms), 0.0)
+
+
+# --- Förkompilerade kärnor (python build_kernels.py) ---
+# Finns modulen används den direkt och JIT-uppvärmningen vid kallstart uteblir
+try:
+    from cycling_kernels import air_density_at, climb_power, gradient_sin_cos, solve_speed  # noqa: F811
+except ImportError:
+    pass
@@ -0,0 +1,46 @@
+import streamlit as st
+
+# --- Custom Styling (gemensam för alla kalkylatorsidor) ---
+CSS = """
+    <style>
+    @import url('https://fonts.googleapis.com/css2?family=Montserrat:wght@300;400;700&display=swap');
+
+    html, body, [class*="st-"] {
+        font-family: 'Montserrat', sans-serif;
+    }
+
+    .result-container {
+        text-align: center;
+        margin-top: 30px;
+        padding: 15px;
+        border-radius: 10px;
+        background-color: #f8f9fa;
+        box-shadow: 2px 2px 10px rgba(0,0,0,0.1);
+    }
+
+    .result-title {
+        font-size: 24px;
+        font-weight: 700;
+        color: #333;
+        margin-bottom: 5px;
+    }
+
+    .result-value {
+        font-size: 32px;
+        font-weight: 400;
+        color: #E6754E;
+    }
+    </style>
+    """
+
+
+@st.cache_resource
+def _inject_css():
+    # Streamlit spelar upp det cachade markdown-elementet vid varje träff
+    st.markdown(CSS, unsafe_allow_html=True)
+
+
+def init_page(title):
+    """Sidinställningar och CSS; anropas först på varje sida, vid varje omkörning."""
+    st.set_page_config(page_title=title, layout="wide")
+    _inject_css()